@@ -12,7 +12,6 @@ Usage:
     python convert_to_iceberg.py s3://bucket/mirrulations [--output-path s3://bucket/output]
 """
 
-import json
 import os
 import sys
 import argparse
@@ -22,6 +21,7 @@ from typing import Dict, List, Any, Optional, Union
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
+import orjson
 from tqdm import tqdm
 import logging
 from datetime import datetime
@@ -247,13 +247,14 @@ class IcebergConverter:
                     return None
                 
                 self.logger.debug(f"Reading S3 file: {file_path}")
-                with self.s3_fs.open(file_path, 'r', encoding='utf-8') as f:
+                with self.s3_fs.open(file_path, 'rb') as f:
                     content = f.read()
-                    self.logger.debug(f"Read {len(content)} characters from {file_path}")
-                    return json.loads(content)
+                    self.logger.debug(f"Read {len(content)} bytes from {file_path}")
+                    return orjson.loads(content)
             else:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                # orjson parses the raw UTF-8 bytes directly, skipping the str decode
+                with open(file_path, 'rb') as f:
+                    return orjson.loads(f.read())
         except PermissionError as e:
             self.logger.error(f"Permission denied reading {file_path}: {e}")
             raise
@@ -262,7 +263,7 @@ class IcebergConverter:
             if not PathHandler.is_s3_path(file_path):
                 self.logger.warning(f"File not found: {file_path}")
             return None
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             self.logger.error(f"JSON decode error reading {file_path}: {e}")
             return None
         except Exception as e:
@@ -9,84 +9,232 @@ This script shows how to:
 4. Show data quality insights
 """
 
-import pandas as pd
+import io
+import os
+import sys
 import duckdb
 import time
-from pathlib import Path
+from contextlib import contextmanager, redirect_stdout
+import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 
 
-def demonstrate_parquet_reading():
+# Optimized Parquet files written by the exploration script
+DEA_2016_PATH = "exploration_output/DEA-2016-0015_comments.parquet"
+DEA_2024_PATH = "exploration_output/DEA-2024-0059_comments.parquet"
+
+# Rows decoded per batch when streaming a file
+STREAM_BATCH_SIZE = 65536
+
+# Columns touched by the analytics demonstrations; Parquet is columnar, so
+# everything else is left undecoded on disk. The data quality report covers
+# every column, so it reads the whole file
+ANALYSIS_COLUMNS = [
+    'comment', 'firstName', 'lastName', 'postedDate',
+    'has_attachments', 'withdrawn',
+]
+
+
+@contextmanager
+def buffered_output():
+    """Collect everything printed in the block and write it to stdout at once"""
+    buffer = io.StringIO()
+    try:
+        with redirect_stdout(buffer):
+            yield
+    finally:
+        sys.stdout.write(buffer.getvalue())
+
+
+def demonstrate_parquet_reading(columns=ANALYSIS_COLUMNS):
     """Demonstrate reading optimized Parquet files"""
     print("=== Parquet File Reading Demonstration ===\n")
     
-    # Read the optimized Parquet files
-    dea_2016_path = "exploration_output/DEA-2016-0015_comments.parquet"
-    dea_2024_path = "exploration_output/DEA-2024-0059_comments.parquet"
-    
     print("Reading DEA-2016-0015 data...")
     start_time = time.time()
-    dea_2016_df = pd.read_parquet(dea_2016_path)
+    dea_2016_table = pq.read_table(DEA_2016_PATH, columns=columns, memory_map=True)
     read_time = time.time() - start_time
     
-    print(f"  Loaded {len(dea_2016_df):,} records in {read_time:.3f}s")
-    print(f"  Memory usage: {dea_2016_df.memory_usage(deep=True).sum() / (1024*1024):.1f} MB")
-    print(f"  Columns: {len(dea_2016_df.columns)}")
+    print(f"  Loaded {dea_2016_table.num_rows:,} records in {read_time:.3f}s")
+    print(f"  Memory usage: {dea_2016_table.nbytes / (1024*1024):.1f} MB")
+    print(f"  Columns: {dea_2016_table.num_columns}")
     
     print("\nReading DEA-2024-0059 data...")
     start_time = time.time()
-    dea_2024_df = pd.read_parquet(dea_2024_path)
+    dea_2024_table = pq.read_table(DEA_2024_PATH, columns=columns, memory_map=True)
     read_time = time.time() - start_time
     
-    print(f"  Loaded {len(dea_2024_df):,} records in {read_time:.3f}s")
-    print(f"  Memory usage: {dea_2024_df.memory_usage(deep=True).sum() / (1024*1024):.1f} MB")
-    print(f"  Columns: {len(dea_2024_df.columns)}")
+    print(f"  Loaded {dea_2024_table.num_rows:,} records in {read_time:.3f}s")
+    print(f"  Memory usage: {dea_2024_table.nbytes / (1024*1024):.1f} MB")
+    print(f"  Columns: {dea_2024_table.num_columns}")
     
-    return dea_2016_df, dea_2024_df
+    return dea_2016_table, dea_2024_table
 
 
-def demonstrate_analytics(df, docket_name):
-    """Demonstrate common analytics on the data"""
-    print(f"\n=== Analytics for {docket_name} ===\n")
-    
-    # Basic statistics
-    print("Basic Statistics:")
-    print(f"  Total comments: {len(df):,}")
-    print(f"  Unique commenters: {df['firstName'].nunique():,}")
-    print(f"  Comments with attachments: {df['has_attachments'].sum():,}")
-    print(f"  Comments withdrawn: {df['withdrawn'].sum():,}")
-    
-    # Comment length analysis
-    df['comment_length'] = df['comment'].str.len()
-    print(f"\nComment Length Analysis:")
-    print(f"  Average length: {df['comment_length'].mean():.0f} characters")
-    print(f"  Median length: {df['comment_length'].median():.0f} characters")
-    print(f"  Shortest comment: {df['comment_length'].min():.0f} characters")
-    print(f"  Longest comment: {df['comment_length'].max():.0f} characters")
-    
-    # Top commenters
-    print(f"\nTop Commenters:")
-    top_commenters = df.groupby(['firstName', 'lastName']).size().sort_values(ascending=False).head(5)
-    for (first, last), count in top_commenters.items():
-        print(f"  {first} {last}: {count} comments")
+def demonstrate_streaming_analytics(path, docket_name):
+    """Demonstrate running aggregates streamed over Parquet batches"""
+    print(f"\n=== Streaming Analytics for {docket_name} ===\n")
     
-    # Date analysis
-    df['posted_date'] = pd.to_datetime(df['postedDate'])
-    print(f"\nDate Analysis:")
-    print(f"  Date range: {df['posted_date'].min().date()} to {df['posted_date'].max().date()}")
-    print(f"  Peak day: {df['posted_date'].dt.date().value_counts().head(1).index[0]}")
-    print(f"  Peak day count: {df['posted_date'].dt.date().value_counts().max():,} comments")
+    start_time = time.time()
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    
+    # Only one batch is decoded at a time, so memory stays flat regardless of file size
+    total_comments = 0
+    with_attachments = 0
+    withdrawn = 0
+    length_count = 0
+    length_sum = 0
+    shortest = None
+    longest = None
+    for batch in parquet_file.iter_batches(batch_size=STREAM_BATCH_SIZE,
+                                           columns=['comment', 'has_attachments', 'withdrawn']):
+        total_comments += batch.num_rows
+        with_attachments += pc.sum(batch.column('has_attachments')).as_py() or 0
+        withdrawn += pc.sum(batch.column('withdrawn')).as_py() or 0
+        
+        lengths = pc.utf8_length(batch.column('comment'))
+        batch_count = pc.count(lengths).as_py()
+        if batch_count == 0:
+            continue
+        length_count += batch_count
+        length_sum += pc.sum(lengths).as_py()
+        batch_bounds = pc.min_max(lengths).as_py()
+        shortest = batch_bounds['min'] if shortest is None else min(shortest, batch_bounds['min'])
+        longest = batch_bounds['max'] if longest is None else max(longest, batch_bounds['max'])
+    
+    elapsed = time.time() - start_time
+    print(f"  Streamed {total_comments:,} records from {parquet_file.metadata.num_row_groups} row groups in {elapsed:.3f}s")
+    print(f"  Comments with attachments: {with_attachments:,}")
+    print(f"  Comments withdrawn: {withdrawn:,}")
+    if length_count:
+        print(f"  Average length: {length_sum / length_count:.0f} characters")
+        print(f"  Shortest comment: {shortest:,} characters")
+        print(f"  Longest comment: {longest:,} characters")
+
+
+def demonstrate_analytics(table, docket_name):
+    """Demonstrate common analytics on the data"""
+    with buffered_output():
+        print(f"\n=== Analytics for {docket_name} ===\n")
+        
+        # Basic statistics (boolean sums popcount Arrow's packed bitmaps)
+        print("Basic Statistics:")
+        print(f"  Total comments: {table.num_rows:,}")
+        print(f"  Unique commenters: {pc.count_distinct(table['firstName']).as_py():,}")
+        print(f"  Comments with attachments: {pc.sum(table['has_attachments']).as_py():,}")
+        print(f"  Comments withdrawn: {pc.sum(table['withdrawn']).as_py():,}")
+        
+        # Comment length analysis (Arrow kernels work directly on the UTF-8 buffers)
+        comments = table['comment']
+        comment_lengths = pc.utf8_length(comments)
+        print(f"\nComment Length Analysis:")
+        print(f"  Average length: {pc.mean(comment_lengths).as_py():.0f} characters")
+        print(f"  Median length: {pc.approximate_median(comment_lengths).as_py():.0f} characters")
+        print(f"  Shortest comment: {pc.min(comment_lengths).as_py():.0f} characters")
+        print(f"  Longest comment: {pc.max(comment_lengths).as_py():.0f} characters")
+        print(f"  Mentioning 'health': {pc.sum(pc.match_substring(comments, 'health')).as_py():,} comments")
+        
+        # Top commenters (hash aggregate, then a bounded top-k instead of a full sort)
+        print(f"\nTop Commenters:")
+        names = table.select(['firstName', 'lastName'])
+        names = names.filter(pc.and_(pc.is_valid(names['firstName']), pc.is_valid(names['lastName'])))
+        commenter_counts = names.group_by(['firstName', 'lastName']).aggregate([([], 'count_all')])
+        top_indices = pc.select_k_unstable(commenter_counts, k=5, sort_keys=[('count_all', 'descending')])
+        for row in commenter_counts.take(top_indices).to_pylist():
+            print(f"  {row['firstName']} {row['lastName']}: {row['count_all']} comments")
+        
+        # Date analysis (truncate to days as int64 timestamps, no per-row date objects)
+        posted_day = pc.floor_temporal(table['postedDate'].cast(pa.timestamp('s', tz='UTC')), unit='day')
+        date_range = pc.min_max(posted_day).as_py()
+        day_counts = pa.table({'day': posted_day}).group_by('day').aggregate([([], 'count_all')])
+        day_counts = day_counts.filter(pc.is_valid(day_counts['day']))
+        peak_day = day_counts.take(pc.select_k_unstable(day_counts, k=1, sort_keys=[('count_all', 'descending')]))
+        print(f"\nDate Analysis:")
+        print(f"  Date range: {date_range['min'].date()} to {date_range['max'].date()}")
+        print(f"  Peak day: {peak_day['day'][0].as_py().date()}")
+        print(f"  Peak day count: {peak_day['count_all'][0].as_py():,} comments")
+
+
+def demonstrate_polars_analytics(path, docket_name):
+    """Demonstrate the analytics as lazy Polars queries on the streaming engine
+
+    Polars is optional; the demonstration is skipped when it is not installed.
+    """
+    try:
+        import polars as pl
+    except ImportError:
+        print(f"\nPolars not installed - skipping Polars analytics for {docket_name}")
+        return
     
-    return df
+    with buffered_output():
+        print(f"\n=== Polars Streaming Analytics for {docket_name} ===\n")
+        
+        # scan_parquet pushes projections and filters into the reader, and each
+        # query below runs as a single fused streaming pass over the file
+        start_time = time.time()
+        comments = pl.scan_parquet(path)
+        comment_length = pl.col('comment').str.len_chars()
+        posted_day = pl.col('postedDate').str.to_datetime(time_zone='UTC').dt.date()
+        
+        summary = comments.select(
+            pl.len().alias('total'),
+            pl.col('firstName').drop_nulls().n_unique().alias('unique_commenters'),
+            pl.col('has_attachments').sum().alias('with_attachments'),
+            pl.col('withdrawn').sum().alias('withdrawn'),
+            comment_length.mean().alias('mean_length'),
+            comment_length.median().alias('median_length'),
+            comment_length.min().alias('min_length'),
+            comment_length.max().alias('max_length'),
+            posted_day.min().alias('first_day'),
+            posted_day.max().alias('last_day'),
+        ).collect(engine='streaming').row(0, named=True)
+        
+        top_commenters = (
+            comments
+            .filter(pl.col('firstName').is_not_null() & pl.col('lastName').is_not_null())
+            .group_by('firstName', 'lastName')
+            .agg(pl.len().alias('count'))
+            .top_k(5, by='count')
+            .collect(engine='streaming')
+        )
+        
+        peak_day = (
+            comments
+            .select(posted_day.alias('day'))
+            .drop_nulls()
+            .group_by('day')
+            .agg(pl.len().alias('count'))
+            .top_k(1, by='count')
+            .collect(engine='streaming')
+            .row(0, named=True)
+        )
+        elapsed = time.time() - start_time
+        
+        print(f"  Queries completed in {elapsed:.3f}s")
+        print(f"  Total comments: {summary['total']:,}")
+        print(f"  Unique commenters: {summary['unique_commenters']:,}")
+        print(f"  Comments with attachments: {summary['with_attachments']:,}")
+        print(f"  Comments withdrawn: {summary['withdrawn']:,}")
+        print(f"  Average length: {summary['mean_length']:.0f} characters")
+        print(f"  Median length: {summary['median_length']:.0f} characters")
+        print(f"  Shortest comment: {summary['min_length']:.0f} characters")
+        print(f"  Longest comment: {summary['max_length']:.0f} characters")
+        print(f"  Top commenters:")
+        for row in top_commenters.iter_rows(named=True):
+            print(f"    {row['firstName']} {row['lastName']}: {row['count']} comments")
+        print(f"  Date range: {summary['first_day']} to {summary['last_day']}")
+        print(f"  Peak day: {peak_day['day']} ({peak_day['count']:,} comments)")
 
 
-def demonstrate_query_performance(df, docket_name):
+def demonstrate_query_performance(path, docket_name):
     """Demonstrate query performance with DuckDB"""
     print(f"\n=== Query Performance for {docket_name} ===\n")
     
-    # Create DuckDB connection
+    # Create DuckDB connection; querying the Parquet file directly lets DuckDB
+    # read only the column chunks each query references
     con = duckdb.connect(':memory:')
-    con.register('comments', df)
+    con.execute(f"CREATE VIEW comments AS SELECT * FROM read_parquet('{path}')")
     
     # Test queries
     queries = [
@@ -136,37 +284,58 @@ def demonstrate_query_performance(df, docket_name):
 
 def demonstrate_data_quality(df, docket_name):
     """Demonstrate data quality analysis"""
-    print(f"\n=== Data Quality Analysis for {docket_name} ===\n")
-    
-    # Null value analysis
-    print("Null Value Analysis:")
-    null_counts = df.isnull().sum()
-    null_percentages = (null_counts / len(df)) * 100
-    
-    for col in df.columns:
-        if null_counts[col] > 0:
-            print(f"  {col}: {null_counts[col]:,} nulls ({null_percentages[col]:.1f}%)")
-    
-    # Data type analysis
-    print(f"\nData Type Analysis:")
-    for dtype in df.dtypes.unique():
-        cols = df.select_dtypes(include=[dtype]).columns
-        print(f"  {dtype}: {len(cols)} columns")
-    
-    # Value distribution for key columns
-    print(f"\nValue Distribution Analysis:")
-    
-    # Agency ID
-    print(f"  agencyId: {df['agencyId'].value_counts().to_dict()}")
-    
-    # Document type
-    print(f"  documentType: {df['documentType'].value_counts().to_dict()}")
-    
-    # Withdrawn status
-    print(f"  withdrawn: {df['withdrawn'].value_counts().to_dict()}")
-    
-    # Attachment status
-    print(f"  has_attachments: {df['has_attachments'].value_counts().to_dict()}")
+    with buffered_output():
+        print(f"\n=== Data Quality Analysis for {docket_name} ===\n")
+        
+        # Null value analysis
+        print("Null Value Analysis:")
+        null_counts = df.isnull().sum()
+        null_percentages = (null_counts / len(df)) * 100
+        
+        for col in df.columns:
+            if null_counts[col] > 0:
+                print(f"  {col}: {null_counts[col]:,} nulls ({null_percentages[col]:.1f}%)")
+        
+        # Data type analysis
+        print(f"\nData Type Analysis:")
+        # Count by name; each categorical column has its own CategoricalDtype
+        for dtype, column_count in df.dtypes.astype(str).value_counts().items():
+            print(f"  {dtype}: {column_count} columns")
+        
+        # Value distribution for key columns
+        print(f"\nValue Distribution Analysis:")
+        
+        # Agency ID
+        print(f"  agencyId: {df['agencyId'].value_counts().to_dict()}")
+        
+        # Document type
+        print(f"  documentType: {df['documentType'].value_counts().to_dict()}")
+        
+        # Withdrawn status
+        print(f"  withdrawn: {df['withdrawn'].value_counts().to_dict()}")
+        
+        # Attachment status
+        print(f"  has_attachments: {df['has_attachments'].value_counts().to_dict()}")
+
+
+def scan_parquet_files(path):
+    """Return (file_count, total_bytes) for the Parquet files under a directory.
+
+    A single os.scandir sweep picks up the sizes from the directory entries,
+    rather than globbing and then stat-ing every file a second time.
+    """
+    file_count = 0
+    total_bytes = 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                sub_count, sub_bytes = scan_parquet_files(entry.path)
+                file_count += sub_count
+                total_bytes += sub_bytes
+            elif entry.name.endswith(".parquet"):
+                file_count += 1
+                total_bytes += entry.stat(follow_symlinks=False).st_size
+    return file_count, total_bytes
 
 
 def demonstrate_optimization_benefits():
@@ -174,47 +343,26 @@ def demonstrate_optimization_benefits():
     print("\n=== Optimization Benefits Demonstration ===\n")
     
     # Show file sizes
-    base_path = Path("exploration_output")
+    base_path = "exploration_output"
     
     print("File Size Comparison:")
     
-    # DEA-2016-0015
-    dea_2016_base = base_path / "DEA-2016-0015_comments.parquet"
-    dea_2016_fragmented = base_path / "DEA-2016-0015_fragmented"
-    dea_2016_optimized = base_path / "DEA-2016-0015_optimized"
-    
-    if dea_2016_base.exists():
-        base_size = dea_2016_base.stat().st_size / (1024*1024)
-        print(f"  DEA-2016-0015 base file: {base_size:.2f} MB")
-    
-    if dea_2016_fragmented.exists():
-        fragmented_files = list(dea_2016_fragmented.glob("*.parquet"))
-        fragmented_size = sum(f.stat().st_size for f in fragmented_files) / (1024*1024)
-        print(f"  DEA-2016-0015 fragmented: {len(fragmented_files)} files, {fragmented_size:.2f} MB")
-    
-    if dea_2016_optimized.exists():
-        optimized_files = list(dea_2016_optimized.glob("*.parquet"))
-        optimized_size = sum(f.stat().st_size for f in optimized_files) / (1024*1024)
-        print(f"  DEA-2016-0015 optimized: {len(optimized_files)} files, {optimized_size:.2f} MB")
-    
-    # DEA-2024-0059
-    dea_2024_base = base_path / "DEA-2024-0059_comments.parquet"
-    dea_2024_fragmented = base_path / "DEA-2024-0059_fragmented"
-    dea_2024_optimized = base_path / "DEA-2024-0059_optimized"
-    
-    if dea_2024_base.exists():
-        base_size = dea_2024_base.stat().st_size / (1024*1024)
-        print(f"  DEA-2024-0059 base file: {base_size:.2f} MB")
-    
-    if dea_2024_fragmented.exists():
-        fragmented_files = list(dea_2024_fragmented.glob("*.parquet"))
-        fragmented_size = sum(f.stat().st_size for f in fragmented_files) / (1024*1024)
-        print(f"  DEA-2024-0059 fragmented: {len(fragmented_files)} files, {fragmented_size:.2f} MB")
-    
-    if dea_2024_optimized.exists():
-        optimized_files = list(dea_2024_optimized.glob("*.parquet"))
-        optimized_size = sum(f.stat().st_size for f in optimized_files) / (1024*1024)
-        print(f"  DEA-2024-0059 optimized: {len(optimized_files)} files, {optimized_size:.2f} MB")
+    for docket_name in ("DEA-2016-0015", "DEA-2024-0059"):
+        base_file = os.path.join(base_path, f"{docket_name}_comments.parquet")
+        fragmented_dir = os.path.join(base_path, f"{docket_name}_fragmented")
+        optimized_dir = os.path.join(base_path, f"{docket_name}_optimized")
+        
+        if os.path.isfile(base_file):
+            base_size = os.path.getsize(base_file) / (1024*1024)
+            print(f"  {docket_name} base file: {base_size:.2f} MB")
+        
+        if os.path.isdir(fragmented_dir):
+            fragmented_count, fragmented_bytes = scan_parquet_files(fragmented_dir)
+            print(f"  {docket_name} fragmented: {fragmented_count} files, {fragmented_bytes / (1024*1024):.2f} MB")
+        
+        if os.path.isdir(optimized_dir):
+            optimized_count, optimized_bytes = scan_parquet_files(optimized_dir)
+            print(f"  {docket_name} optimized: {optimized_count} files, {optimized_bytes / (1024*1024):.2f} MB")
 
 
 def main():
@@ -224,19 +372,27 @@ def main():
     
     try:
         # Read optimized data
-        dea_2016_df, dea_2024_df = demonstrate_parquet_reading()
+        dea_2016_table, dea_2024_table = demonstrate_parquet_reading()
+        
+        # Demonstrate streaming aggregates
+        demonstrate_streaming_analytics(DEA_2016_PATH, "DEA-2016-0015")
+        demonstrate_streaming_analytics(DEA_2024_PATH, "DEA-2024-0059")
         
         # Demonstrate analytics
-        dea_2016_df = demonstrate_analytics(dea_2016_df, "DEA-2016-0015")
-        dea_2024_df = demonstrate_analytics(dea_2024_df, "DEA-2024-0059")
+        demonstrate_analytics(dea_2016_table, "DEA-2016-0015")
+        demonstrate_analytics(dea_2024_table, "DEA-2024-0059")
+        
+        # Demonstrate the Polars lazy/streaming alternative
+        demonstrate_polars_analytics(DEA_2016_PATH, "DEA-2016-0015")
+        demonstrate_polars_analytics(DEA_2024_PATH, "DEA-2024-0059")
         
         # Demonstrate query performance
-        demonstrate_query_performance(dea_2016_df, "DEA-2016-0015")
-        demonstrate_query_performance(dea_2024_df, "DEA-2024-0059")
+        demonstrate_query_performance(DEA_2016_PATH, "DEA-2016-0015")
+        demonstrate_query_performance(DEA_2024_PATH, "DEA-2024-0059")
         
         # Demonstrate data quality
-        demonstrate_data_quality(dea_2016_df, "DEA-2016-0015")
-        demonstrate_data_quality(dea_2024_df, "DEA-2024-0059")
+        demonstrate_data_quality(pq.read_table(DEA_2016_PATH, memory_map=True).to_pandas(), "DEA-2016-0015")
+        demonstrate_data_quality(pq.read_table(DEA_2024_PATH, memory_map=True).to_pandas(), "DEA-2024-0059")
         
         # Demonstrate optimization benefits
         demonstrate_optimization_benefits()
@@ -3,11 +3,23 @@
 Script to explore the data directory structure
 """
 
+import io
+from contextlib import redirect_stdout
 from pathlib import Path
 import sys
 
 def explore_structure(data_path):
     """Explore the data directory structure"""
+    # Collect the report and emit it with a single write instead of one per line
+    buffer = io.StringIO()
+    try:
+        with redirect_stdout(buffer):
+            _explore_structure(data_path)
+    finally:
+        sys.stdout.write(buffer.getvalue())
+
+def _explore_structure(data_path):
+    """Print the directory structure report"""
     print(f"Exploring: {data_path}")
     
     if not Path(data_path).exists():
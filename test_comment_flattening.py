@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test that both comment flattening paths build the same table
+
+simple_iceberg_exploration.py flattens comments with Arrow's JSON reader and
+falls back to per-file flattening; this checks the two paths agree and that
+empty comment files are reported instead of silently dropped.
+"""
+
+import io
+import json
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+from simple_iceberg_exploration import (
+    COMMENT_SCHEMA,
+    CommentDataExplorer,
+    build_comment_table,
+    flatten_comment_files,
+)
+
+
+def make_comment(index, attributes, attachment_ids=(), included_ids=()):
+    """Build a raw comment file in the regulations.gov layout"""
+    data = {
+        "id": f"TEST-2024-0001-{index:04d}",
+        "type": "comments",
+        "links": {"self": f"https://example.test/comments/{index}"},
+        "attributes": attributes,
+    }
+    if attachment_ids:
+        data["relationships"] = {"attachments": {"data": [{"id": i} for i in attachment_ids]}}
+    comment = {"data": data}
+    if included_ids:
+        comment["included"] = [{"id": i} for i in included_ids]
+    return json.dumps(comment, indent=2).encode()
+
+
+# Comments covering missing attributes, attributes first seen part way
+# through, an unpinned date attribute, multi-line text and attachments
+SAMPLE_FILES = [
+    make_comment(0, {
+        "agencyId": "TEST", "docketId": "TEST-2024-0001", "documentType": "Public Submission",
+        "comment": "First comment", "firstName": "Ann", "lastName": "Jones",
+        "postedDate": "2024-01-02T05:00:00Z", "effectiveDate": "2024-03-01T05:00:00Z", "withdrawn": False,
+    }, attachment_ids=["a", "b"], included_ids=["a"]),
+    make_comment(1, {
+        "agencyId": "TEST", "docketId": "TEST-2024-0001", "documentType": "Public Submission",
+        "comment": "Line one\nLine two", "withdrawn": True, "pageCount": 3,
+    }),
+    make_comment(2, {
+        "agencyId": "TEST", "docketId": "TEST-2024-0001", "documentType": "Public Submission",
+        "comment": None, "firstName": "Bob", "organization": "Example Org",
+        "postedDate": "2024-01-03T05:00:00Z", "withdrawn": False, "pageCount": 1,
+    }, attachment_ids=["c"]),
+]
+
+
+def test_flattening_parity():
+    """Test the Arrow reader path against the per-file path"""
+    print("Testing comment flattening parity...")
+    
+    arrow_table = flatten_comment_files(SAMPLE_FILES)
+    
+    explorer = CommentDataExplorer()
+    columns = {name: [] for name in COMMENT_SCHEMA.names}
+    for row_index, raw in enumerate(SAMPLE_FILES):
+        explorer.flatten_comment_data(json.loads(raw), columns, row_index)
+    python_table = build_comment_table(columns, len(SAMPLE_FILES))
+    
+    print(f"  Arrow reader: {arrow_table.num_rows} rows, {arrow_table.num_columns} columns")
+    print(f"  Per-file:     {python_table.num_rows} rows, {python_table.num_columns} columns")
+    print(f"  Identical: {arrow_table.equals(python_table)}")
+    assert arrow_table.equals(python_table)
+
+
+def test_empty_file_reported():
+    """Test that empty comment files are reported and skipped"""
+    print("Testing empty comment files...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        json_files = []
+        for index, raw in enumerate(SAMPLE_FILES + [b"", b"  \n"]):
+            json_file = Path(tmp) / f"comment_{index}.json"
+            json_file.write_bytes(raw)
+            json_files.append(json_file)
+        
+        output = io.StringIO()
+        with redirect_stdout(output):
+            table = CommentDataExplorer().load_comments_from_paths("TEST-2024-0001", json_files)
+    
+    reported = output.getvalue().count("file is empty")
+    print(f"  Loaded rows: {table.num_rows} (expected {len(SAMPLE_FILES)})")
+    print(f"  Empty files reported: {reported} (expected 2)")
+    assert table.num_rows == len(SAMPLE_FILES)
+    assert reported == 2
+
+
+if __name__ == "__main__":
+    try:
+        test_flattening_parity()
+        test_empty_file_reported()
+    except AssertionError:
+        print("✗ Flattening paths disagree")
+        sys.exit(1)
+    print("✓ All flattening checks passed")